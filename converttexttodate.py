@@ -1,4 +1,7 @@
-from typing import Literal, Tuple, Union
+import os
+from collections import deque
+from concurrent.futures import ThreadPoolExecutor
+from typing import List, Literal, Optional, Tuple, Union
 
 import numpy as np
 import pyarrow as pa
@@ -18,130 +21,135 @@ REGEXES = {
     "D/M/YY": r"(?P<dd>\d\d?)/(?P<mm>\d\d?)/(?P<yy>\d\d?)",
 }
 
+# Each regex, matching the whole string
+ANCHORED_REGEXES = {format: r"\A" + regex + r"\z" for format, regex in REGEXES.items()}
+
+# Layout of each format's zero-padded values. "Y", "M" and "D" are digits;
+# other characters must match exactly. ("YYYYMMDD" has its own fast path.)
+FIXED_WIDTH_LAYOUTS = {
+    "YYYY-MM-DD": "YYYY-MM-DD",
+    "M/D/YYYY": "MM/DD/YYYY",
+    "D/M/YYYY": "DD/MM/YYYY",
+    "M/D/YY": "MM/DD/YY",
+    "D/M/YY": "DD/MM/YY",
+}
 
-_EPOCH_ORDINAL = -719469
 
+# Days from 1970-01-01 to 0000-03-01, minus the era we add, minus the 1 from
+# "d - 1" -- see _years_months_days_to_epoch_days()
+_EPOCH_OFFSET = -719468 - 146097 - 1
 
-class RenderErrorException(Exception):
-    def __init__(self, render_error):
-        super().__init__(render_error)
-        self.render_error = render_error
+# _years_months_days_to_epoch_days()'s int32 arithmetic is safe up to (at least)
+# this year
+_MAX_YEAR = 5879199
+
+# Multiple of 7 that makes every date's epoch day non-negative: year 0 starts
+# on epoch day -719528. Week arithmetic stays within int32 up to _MAX_YEAR.
+_WEEK_SHIFT = 7 * 102790
 
+# Days in each month of a non-leap year, indexed by month. Parsers read at most
+# two month digits, so months are 0-99; invalid months have 0 days.
+_DAYS_IN_MONTH = pa.array(
+    [0, 31, 28, 31, 30, 31, 30, 31, 31, 30, 31, 30, 31] + [0] * 87, pa.int8()
+)
 
-def i32(i: int) -> pa.Int32Scalar:
-    return pa.scalar(i, pa.int32())
+# Full year of each two-digit "YY" year: 70-99 are 1900s; 00-69 are 2000s
+_YY_TO_YYYY = pa.array(
+    [yy + (1900 if yy > 69 else 2000) for yy in range(100)], pa.int32()
+)
 
+# First month of each month's quarter, indexed by (valid) month
+_QUARTER_START_MONTH = pa.array([0, 1, 1, 1, 4, 4, 4, 7, 7, 7, 10, 10, 10], pa.int8())
 
-def i8(i: int) -> pa.Int8Scalar:
-    return pa.scalar(i, pa.int8())
+# Scalars our kernel calls use, built once instead of once per call
+_I32 = {
+    i: pa.scalar(i, pa.int32())
+    for i in (-2919, 1, 4, 7, 8, 12, 32, 100, 365, 399, 400, 979, 10000)
+    + (_EPOCH_OFFSET, _MAX_YEAR, 3 + _WEEK_SHIFT, 306 + _EPOCH_OFFSET + 1)
+}
+_I8 = {i: pa.scalar(i, pa.int8()) for i in (1, 2, 29)}
+_EMPTY_STRING = pa.scalar("")
 
+# Parse only the distinct values of string arrays longer than this
+_DICTIONARY_ENCODE_MIN_LENGTH = 4096
 
-def _years_months_days_to_date32s(
-    y: pa.Int32Array, m: pa.Int8Array, d: pa.Int8Array
-) -> pa.Date32Array:
-    # http://pmyers.pcug.org.au/IndexedMultipleYearCalendar/Calgo_199.PDF
-
-    # if m > 2 then m-=3 else { m+=9, y-=1 }
-    jan_or_feb = pa.compute.less(m, i8(3))
-    y = pa.compute.subtract(y, jan_or_feb.cast(pa.int32()))
-    m = pa.compute.add(
-        m,
-        # when jan_or_feb==1, +9; when jan_or_feb==0, -3
-        pa.compute.add(pa.compute.multiply(jan_or_feb.cast(pa.int8()), i8(12)), i8(-3)),
-    )
+# Convert runs of chunks shorter than this together: each conversion costs
+# dozens of kernel calls, however few rows it has
+_MIN_BATCH_LENGTH = 8192
 
-    # c = y/100
-    c = pa.compute.divide(y, i32(100))
-    # ya = y - 100*c
-    ya = pa.compute.subtract(y, pa.compute.multiply(c, i32(100)))
-
-    # j = (146097*c)/4 + ...
-    j = pa.compute.divide(pa.compute.multiply(c, i32(146097)), i32(4))
-    # ... (1461 * ya)/4 + ...
-    j = pa.compute.add(j, pa.compute.divide(pa.compute.multiply(ya, i32(1461)), i32(4)))
-    # ... (153*m + 2)/5 + ...
-    j = pa.compute.add(
-        j,
-        pa.compute.divide(
-            pa.compute.add(pa.compute.multiply(m, i32(153)), i32(2)), i32(5)
+# Convert chunks in parallel when a column has at least this many rows
+_PARALLEL_MIN_LENGTH = 65536
+
+
+class RenderErrorException(Exception):
+    def __init__(self, render_error):
+        super().__init__(render_error)
+        self.render_error = render_error
+
+
+def _march_based_year_days(y: pa.Int32Array) -> pa.Int32Array:
+    """Return y*: days from March 1, year 0 to March 1 of (March-based) year Y."""
+    # C = Y / 100
+    c = pa.compute.divide(y, _I32[100])
+    # y* = 1461 * Y / 4 - C + C / 4
+    #    = 365 * Y - C + Y / 4 + C / 4 (ordered so int32 doesn't overflow)
+    return pa.compute.add(
+        pa.compute.add(
+            pa.compute.subtract(pa.compute.multiply(y, _I32[365]), c),
+            pa.compute.divide(y, _I32[4]),
         ),
+        pa.compute.divide(c, _I32[4]),
     )
-    # ... d + ...
-    j = pa.compute.add(j, d)
-    # ... [offset]
-    return pa.compute.add(j, i32(_EPOCH_ORDINAL)).cast(pa.date32())
 
 
-def _date32s_to_years_months_days(
-    date32s: pa.Date32Array,
-) -> Tuple[pa.Int32Array, pa.Int8Array, pa.Int8Array]:
-    # A date is valid iff ymd=>date=>ymd is idempotent
-    # http://pmyers.pcug.org.au/IndexedMultipleYearCalendar/Calgo_199.PDF
-    j = date32s.cast(pa.int32())
-    # j -= [offset]
-    j = pa.compute.subtract(j, i32(_EPOCH_ORDINAL))
-    # y = (4L * j - 1) / 146097
-    y = pa.compute.divide(
-        pa.compute.subtract(pa.compute.multiply(j, i32(4)), i32(-1)), i32(146097)
-    )
-    # j = 4L * j - 1 - 146097*y
-    j = pa.compute.subtract(
-        pa.compute.subtract(pa.compute.multiply(j, i32(4)), i32(1)),
-        pa.compute.multiply(y, i32(146097)),
-    )
-    # d = j/4L
-    d = pa.compute.divide(j, i32(4))
-    # j = (4*d + 3) / 1461
-    j = pa.compute.divide(
-        pa.compute.add(pa.compute.multiply(d, i32(4)), i32(3)), i32(1461)
-    )
-    # d = 4*d + 3 - 1461*j
-    d = pa.compute.subtract(
-        pa.compute.add(pa.compute.multiply(d, i32(4)), i32(3)),
-        pa.compute.multiply(j, i32(1461)),
-    )
-    # d = (d + 4) / 4
-    d = pa.compute.divide(pa.compute.add(d, i32(4)), i32(4))
-    # m = (5*d - 3) / 153
-    m = pa.compute.divide(
-        pa.compute.subtract(pa.compute.multiply(d, i32(5)), i32(3)), i32(153)
+def _years_months_days_to_epoch_days(
+    y: pa.Int32Array, m: pa.Int8Array, d: Union[pa.Int8Array, pa.Int32Scalar]
+) -> pa.Int32Array:
+    """Count days since 1970-01-01 -- the int32 behind a date32."""
+    # Neri & Schneider, "Euclidean affine functions and their application to
+    # calendar algorithms" https://arxiv.org/abs/2102.06959
+    #
+    # Count days since March 1, year 0, so leap days fall at the end of each
+    # (March-based) year. Arrow's integer divide truncates towards zero; the
+    # paper floors. They agree on non-negative numbers. Our years are >= 0, so
+    # we add one era (400 years) to keep Jan/Feb of year 0 non-negative, and we
+    # subtract it at the end.
+
+    # J = m <= 2 (Jan/Feb are months 13/14 of the previous year)
+    j = pa.compute.less_equal(m, _I8[2]).cast(pa.int32())
+    # Y = y - J [+ 400]
+    y = pa.compute.add(pa.compute.subtract(y, j), _I32[400])
+    # M = m + 12 * J  [3, 14]
+    m = pa.compute.add(m, pa.compute.multiply(j, _I32[12]))
+    y_star = _march_based_year_days(y)
+    # m* = (979 * M - 2919) / 32  (days from March 1 to the 1st of month M)
+    m_star = pa.compute.divide(
+        pa.compute.add(pa.compute.multiply(m, _I32[979]), _I32[-2919]), _I32[32]
     )
-    # d = 5*d - 3 - 153*m
-    d = pa.compute.subtract(
-        pa.compute.subtract(pa.compute.multiply(d, i32(5)), i32(3)),
-        pa.compute.multiply(m, i32(153)),
+    # N = y* + m* + d - 1; then shift N's epoch to 1970-01-01
+    return pa.compute.add(
+        pa.compute.add(pa.compute.add(y_star, m_star), d), _I32[_EPOCH_OFFSET]
     )
-    # d = (d + 5) / 5
-    d = pa.compute.divide(pa.compute.add(d, i32(5)), i32(5))
-    # y = 100L * y + j
-    y = pa.compute.add(pa.compute.multiply(y, i32(100)), j)
-    # if m<10 { m += 3 } else { m -= 9; y += 1 }
-    oct_nov_dec = pa.compute.greater(m, 9)
-    m = pa.compute.add(
-        m,
-        # m>=10: add -9; m<10: add +3
-        pa.compute.add(
-            pa.compute.multiply(oct_nov_dec.cast(pa.int8()), i8(-12)), i8(3)
-        ),
-    )
-    y = pa.compute.add(y, oct_nov_dec.cast(pa.int32()))
 
-    return y, m.cast(pa.int8()), d.cast(pa.int8())
 
+def _year_start_epoch_days(y: pa.Int32Array) -> pa.Int32Array:
+    """Like `_years_months_days_to_epoch_days(y, 1, 1)`, with constants folded."""
+    # January 1 is day 1 of month M=13 of (March-based) year Y = y - 1 [+ 400]
+    y_star = _march_based_year_days(pa.compute.add(y, _I32[399]))
+    # m* = (979 * 13 - 2919) / 32 = 306; N = y* + m* + 1 - 1
+    return pa.compute.add(y_star, _I32[306 + _EPOCH_OFFSET + 1])
+
+
+# pyarrow 4.0.0's extract_regex() garbles rows after a null or mismatch
+_HAS_ARROW_12670 = pa.__version__ == "4.0.0"
 
-def _struct_string_field_with_nulls(array: pa.StructArray, name: str) -> pa.Array:
-    """Like `array.field(name)`, but nulls become null."""
-    assert array.offset == 0
-    field = array.field(name)
-    _, value_offsets, data = field.buffers()
-    return pa.StringArray.from_buffers(
-        len(array), value_offsets, data, array.buffers()[0], array.null_count, 0
-    )
 
+def _extract_regex(array: pa.StringArray, *, pattern: str) -> pa.StructArray:
+    """Like `extract_regex()`: one struct per row, null on mismatch."""
+    if not _HAS_ARROW_12670:
+        return pa.compute.extract_regex(array, pattern=pattern)
 
-def _extract_regex_workaround_arrow_12670(
-    array: pa.StringArray, *, pattern: str
-) -> pa.StructArray:
+    # ARROW-12670 workaround: extract from matches only, then take() them
     ok = pa.compute.match_substring_regex(array, pattern=pattern)
     good = array.filter(ok)
     good_matches = pa.compute.extract_regex(good, pattern=pattern)
@@ -150,8 +158,8 @@ def _extract_regex_workaround_arrow_12670(
     # ... ok_nonnull: [False, True, False, True, True, True, False, True]
     # (not ok.fill_null(False).cast(pa.int8()) because of ARROW-12672 segfault)
     ok_nonnull = pa.compute.and_kleene(ok.is_valid(), ok)
-    # ... np_ok: [0, 1, 0, 1, 1, 1, 0, 1]
-    np_ok = ok_nonnull.cast(pa.int8()).to_numpy(zero_copy_only=False)
+    # ... np_ok: [0, 1, 0, 1, 1, 1, 0, 1] (as np.bool_ -- no int8 cast kernel)
+    np_ok = ok_nonnull.to_numpy(zero_copy_only=False)
     # ... np_index: [0, 1, 1, 2, 3, 4, 4, 5]
     np_index = np.cumsum(np_ok, dtype=np.int64) - 1
     # ...index_or_null: [None, 1, None, 3, 4, 5, None, 5]
@@ -163,6 +171,236 @@ def _extract_regex_workaround_arrow_12670(
     return good_matches.take(index_or_null)
 
 
+def _with_validity(array: pa.Array, validity: pa.Buffer) -> pa.Array:
+    """Like `array`, but with the given validity bitmap (bit 0 is `array[0]`).
+
+    Zero-copy, unless `array` is a slice.
+    """
+    if array.offset:
+        # array's buffers start at array.offset, so shift the bitmap to match
+        bits = np.unpackbits(
+            np.frombuffer(validity, dtype=np.uint8), count=len(array), bitorder="little"
+        )
+        padding = np.zeros(array.offset, dtype=np.uint8)
+        validity = pa.py_buffer(
+            np.packbits(np.concatenate([padding, bits]), bitorder="little")
+        )
+    return pa.Array.from_buffers(
+        array.type,
+        len(array),
+        [validity, *array.buffers()[1:]],
+        offset=array.offset,
+    )
+
+
+def _without_validity(array: pa.Array) -> pa.Array:
+    """Like `array`, but with no nulls: null rows expose their values. Zero-copy."""
+    return pa.Array.from_buffers(
+        array.type, len(array), [None, *array.buffers()[1:]], offset=array.offset
+    )
+
+
+def _first_true_index(mask: pa.BooleanArray) -> int:
+    """Return the index of the first true value in `mask`. (Nulls aren't true.)"""
+    # pyarrow 4 has no index() kernel; and filter() would copy values
+    mask = pa.compute.and_kleene(mask.is_valid(), mask)
+    return int(np.argmax(mask.to_numpy(zero_copy_only=False)))
+
+
+def _raise_on_format_mismatch(
+    column_name: str,
+    strings: pa.StringArray,
+    mismatches: pa.BooleanArray,
+    format: str,
+    error_means_null: bool,
+) -> None:
+    """Raise RenderErrorException("error.formatMismatch") if any mismatch is true.
+
+    Do nothing if error_means_null.
+    """
+    if mismatches.true_count:
+        if not error_means_null:
+            value = strings[_first_true_index(mismatches)].as_py()
+            raise RenderErrorException(
+                RenderError(
+                    trans(
+                        "error.formatMismatch",
+                        "In “{column}”, the value “{value}” does not look like “{format}”. Try changing this step's parameters; or using 'Clean text' before this step; or using 'Convert text to timestamp' instead of this step.",
+                        dict(
+                            column=column_name,
+                            value=value,
+                            format=format,
+                        ),
+                    )
+                )
+            )
+
+
+def _parse_unvalidated_yyyymmdd(
+    column_name: str, strings: pa.StringArray, error_means_null: bool
+) -> Tuple[pa.Int32Array, pa.Int8Array, pa.Int8Array]:
+    """Parse (years, months, days) from "YYYYMMDD" strings, without a regex.
+
+    Like `_parse_unvalidated_years_months_days()`, but cheaper: "YYYYMMDD" is
+    exactly eight ASCII digits, so one int cast gives us all three numbers.
+    """
+    ok = pa.compute.and_(
+        pa.compute.ascii_is_decimal(strings),
+        pa.compute.equal(pa.compute.binary_length(strings), _I32[8]),
+    )
+    mismatches = pa.compute.and_(
+        pa.compute.not_equal(strings, _EMPTY_STRING), pa.compute.invert(ok)
+    )
+
+    _raise_on_format_mismatch(
+        column_name, strings, mismatches, "YYYYMMDD", error_means_null=error_means_null
+    )
+
+    if ok.false_count:
+        # "" (and mismatches, if error_means_null) won't cast to int: nix them
+        validity = pa.compute.and_kleene(ok.is_valid(), ok).buffers()[1]
+        strings = _with_validity(strings, validity)
+
+    yyyymmdd = strings.cast(pa.int32())
+    years = pa.compute.divide(yyyymmdd, _I32[10000])
+    yyyymm = pa.compute.divide(yyyymmdd, _I32[100])
+    months = pa.compute.subtract(yyyymm, pa.compute.multiply(years, _I32[100]))
+    days = pa.compute.subtract(yyyymmdd, pa.compute.multiply(yyyymm, _I32[100]))
+    return years, months.cast(pa.int8()), days.cast(pa.int8())
+
+
+def _fixed_width_bytes(
+    strings: pa.StringArray, width: int
+) -> Optional[Tuple[np.ndarray, np.ndarray]]:
+    """Gather the bytes of strings' values, if they are all `width` bytes long.
+
+    Return (present, chars). `present` is a bool mask: True for each value that
+    is neither null nor "". `chars` is a (present.sum(), width) uint8 array.
+
+    Return None if some value is neither null, "" nor `width` bytes long.
+    """
+    n = len(strings)
+    _, offsets_buf, data_buf = strings.buffers()
+    offsets = np.frombuffer(
+        offsets_buf, dtype=np.int32, count=n + 1, offset=strings.offset * 4
+    )
+    lengths = np.diff(offsets)
+    # "" is null
+    present = strings.is_valid().to_numpy(zero_copy_only=False) & (lengths != 0)
+    if not np.all(lengths[present] == width):
+        return None
+
+    starts = offsets[:-1][present]
+    if not len(starts):
+        return present, np.empty((0, width), dtype=np.uint8)
+
+    # Memory: `chars` costs `width` bytes per value, plus (when we gather) 4
+    # bytes per value for one column's indices. Never build an (n, width)
+    # index matrix: that's 8 * width bytes per value.
+    data = np.frombuffer(data_buf, dtype=np.uint8)
+    if offsets[-1] - offsets[0] == len(starts) * width:
+        # Nulls and "" take no bytes, so present values are contiguous
+        chars = data[offsets[0] : offsets[-1]].reshape(-1, width)  # zero-copy
+    else:
+        chars = np.empty((len(starts), width), dtype=np.uint8)
+        for i in range(width):
+            chars[:, i] = data[starts + i]
+    return present, chars
+
+
+def _present_values_to_arrow(
+    present: np.ndarray, values: np.ndarray, dtype: np.dtype
+) -> pa.Array:
+    """Build an array that holds `values` where `present`, and null elsewhere."""
+    n = len(present)
+    data = np.zeros(n, dtype=dtype)
+    data[present] = values
+    validity = pa.py_buffer(np.packbits(present, bitorder="little"))
+    return pa.Array.from_buffers(
+        pa.from_numpy_dtype(dtype), n, [validity, pa.py_buffer(data)]
+    )
+
+
+def _parse_unvalidated_fixed_width(
+    strings: pa.StringArray, layout: str
+) -> Optional[Tuple[pa.Int32Array, pa.Int8Array, pa.Int8Array]]:
+    """Parse (years, months, days) straight from the bytes of strings.
+
+    Return None unless every value is null, "" or exactly `layout` -- e.g.,
+    "MM/DD/YYYY" fits "04/05/2021" but not "4/5/2021". Then the caller should
+    fall back to the regex, which handles the general case and reports errors.
+
+    The returned years, months and days might be invalid -- e.g., month=31.
+    """
+    gathered = _fixed_width_bytes(strings, len(layout))
+    if gathered is None:
+        return None
+    present, chars = gathered
+    digits = chars - np.uint8(ord("0"))  # non-digits wrap around to >9
+
+    is_digit = np.array([c in "YMD" for c in layout])
+    if not np.all(digits[:, is_digit] <= 9):
+        return None
+    literals = np.frombuffer(layout.encode("ascii"), dtype=np.uint8)
+    if not np.all(chars[:, ~is_digit] == literals[~is_digit]):
+        return None
+
+    numbers = {}
+    for letter in "YMD":
+        columns = [i for i, c in enumerate(layout) if c == letter]
+        place_values = 10 ** np.arange(len(columns) - 1, -1, -1, dtype=np.int32)
+        numbers[letter] = digits[:, columns] @ place_values
+    if layout.count("Y") == 2:
+        # Same pivot as the regex path: 00-69 => 2000s; 70-99 => 1900s
+        yy = numbers["Y"]
+        numbers["Y"] = yy + np.where(yy > 69, 1900, 2000).astype(np.int32)
+
+    return (
+        _present_values_to_arrow(present, numbers["Y"], np.int32),
+        _present_values_to_arrow(present, numbers["M"], np.int8),
+        _present_values_to_arrow(present, numbers["D"], np.int8),
+    )
+
+
+def _parse_unvalidated_yyyymmdd_swar(
+    strings: pa.StringArray,
+) -> Optional[Tuple[pa.Int32Array, pa.Int8Array, pa.Int8Array]]:
+    """Parse (years, months, days) from "YYYYMMDD" strings, eight bytes at a time.
+
+    Each value is exactly eight bytes, so we load it as one little-endian
+    uint64 and use SWAR ("SIMD within a register") tricks from simdjson.
+
+    Return None unless every value is null, "" or eight ASCII digits. Then the
+    caller should fall back to `_parse_unvalidated_yyyymmdd()`, which reports
+    errors.
+    """
+    gathered = _fixed_width_bytes(strings, 8)
+    if gathered is None:
+        return None
+    present, chars = gathered
+    v = chars.view("<u8").ravel()  # first character is the low byte
+
+    # Every byte is '0'-'9' iff no byte's high bit is set after adding
+    # 0x46 (so bytes > '9' overflow past 0x7f) or subtracting 0x30 (so bytes
+    # < '0' wrap around)
+    if np.any(
+        ((v + np.uint64(0x4646464646464646)) | (v - np.uint64(0x3030303030303030)))
+        & np.uint64(0x8080808080808080)
+    ):
+        return None
+
+    # Pair up digits: 16-bit lane i holds the number made of characters 2i, 2i+1
+    v = ((v & np.uint64(0x0F0F0F0F0F0F0F0F)) * np.uint64(2561)) >> np.uint64(8)
+    pairs = [(v >> np.uint64(16 * i)) & np.uint64(0xFF) for i in range(4)]
+
+    years = pairs[0].astype(np.int32) * 100 + pairs[1].astype(np.int32)
+    return (
+        _present_values_to_arrow(present, years, np.int32),
+        _present_values_to_arrow(present, pairs[2], np.int8),
+        _present_values_to_arrow(present, pairs[3], np.int8),
+    )
+
+
 def _parse_unvalidated_years_months_days(
     column_name: str,
     strings: pa.StringArray,
@@ -178,90 +416,165 @@ def _parse_unvalidated_years_months_days(
 
     The returned years, months and days might be invalid -- e.g., month=31.
     """
-    structs = _extract_regex_workaround_arrow_12670(strings, pattern=pattern)
+    structs = _extract_regex(strings, pattern=pattern)
     mismatches = pa.compute.and_(
         pa.compute.and_(
-            strings.is_valid(), pa.compute.not_equal(strings, pa.scalar(""))
+            strings.is_valid(), pa.compute.not_equal(strings, _EMPTY_STRING)
         ),
         structs.is_null(),
     )
 
-    if mismatches.true_count:
-        if not error_means_null:
-            invalid_strings = strings.filter(mismatches)
-            raise RenderErrorException(
-                RenderError(
-                    trans(
-                        "error.formatMismatch",
-                        "In “{column}”, the value “{value}” does not look like “{format}”. Try changing this step's parameters; or using 'Clean text' before this step; or using 'Convert text to timestamp' instead of this step.",
-                        dict(
-                            column=column_name,
-                            value=invalid_strings[0].as_py(),
-                            format=format,
-                        ),
-                    )
-                )
-            )
+    _raise_on_format_mismatch(
+        column_name, strings, mismatches, format, error_means_null=error_means_null
+    )
 
-    if "?P<yy>" in pattern:
-        yy = _struct_string_field_with_nulls(structs, "yy").cast(pa.int32())
-        offset = pa.compute.add(
-            pa.compute.multiply(
-                pa.compute.greater(yy, i32(69)).cast(pa.int32()),
-                pa.scalar(-100, pa.int32()),
-            ),
-            pa.scalar(2000, pa.int32()),
-        )
-        years = pa.compute.add(yy, offset)
+    # flatten() nulls mismatched rows, so cast() skips their "" values
+    fields = {
+        field.name: array for field, array in zip(structs.type, structs.flatten())
+    }
+    if "yy" in fields:
+        years = _YY_TO_YYYY.take(fields["yy"].cast(pa.int32()))
     else:
-        years = _struct_string_field_with_nulls(structs, "yyyy").cast(pa.int32())
-    months = _struct_string_field_with_nulls(structs, "mm").cast(pa.int8())
-    days = _struct_string_field_with_nulls(structs, "dd").cast(pa.int8())
+        years = fields["yyyy"].cast(pa.int32())
+    months = fields["mm"].cast(pa.int8())
+    days = fields["dd"].cast(pa.int8())
     return years, months, days
 
 
-def _validate_date32s(
+def _is_multiple(y: pa.Int32Array, n: int) -> pa.BooleanArray:
+    # y % n == 0 (pyarrow 4 has no modulo kernel)
+    return pa.compute.equal(
+        y, pa.compute.multiply(pa.compute.divide(y, _I32[n]), _I32[n])
+    )
+
+
+def _validate_years_months_days(
     name: str,
     strings: pa.StringArray,
     years: pa.Int32Array,
     months: pa.Int8Array,
     days: pa.Int8Array,
-    date32s: pa.Date32Array,
     error_means_null: bool,
-) -> Tuple[pa.Int32Array, pa.Int8Array, pa.Int8Array, pa.Date32Array]:
+) -> Tuple[pa.Int32Array, pa.Int8Array, pa.Int8Array]:
     """Raise RenderErrorException("error.invalidDate") on invalid dates.
 
-    If error_means_null, then return copies of input arrays, replacing invalid
-    dates with null.
+    If error_means_null, then return zero-copy views of the input arrays that
+    share one validity bitmap: null where a date is invalid or was null.
     """
-    check_years, check_months, check_days = _date32s_to_years_months_days(date32s)
-
     valid = pa.compute.and_(
-        pa.compute.and_(
-            pa.compute.equal(years, check_years), pa.compute.equal(months, check_months)
-        ),
-        pa.compute.equal(days, check_days),
+        pa.compute.greater_equal(days, _I8[1]),
+        pa.compute.less_equal(days, _DAYS_IN_MONTH.take(months)),
     )
 
+    # Leap years only matter on Feb 29. Usually there are none: skip the math.
+    feb_29 = pa.compute.and_(
+        pa.compute.equal(months, _I8[2]), pa.compute.equal(days, _I8[29])
+    )
+    if feb_29.true_count:
+        is_leap = pa.compute.and_(
+            _is_multiple(years, 4),
+            pa.compute.or_(
+                pa.compute.invert(_is_multiple(years, 100)), _is_multiple(years, 400)
+            ),
+        )
+        valid = pa.compute.or_(valid, pa.compute.and_(feb_29, is_leap))
+
+    valid = pa.compute.and_(valid, pa.compute.less_equal(years, _I32[_MAX_YEAR]))
+
     if valid.false_count:
         if not error_means_null:
-            invalid_strings = strings.filter(pa.compute.invert(valid))
+            value = strings[_first_true_index(pa.compute.invert(valid))].as_py()
             raise RenderErrorException(
                 RenderError(
                     trans(
                         "error.invalidDate",
                         "Invalid date “{value}” in column “{column}”: there is no such month/day in that year.",
-                        dict(column=name, value=invalid_strings[0].as_py()),
+                        dict(column=name, value=value),
                     )
                 )
             )
 
-        valid_or_null = pa.compute.or_kleene(valid, pa.scalar(None, pa.bool_()))
-        years = years.filter(valid_or_null, null_selection_behavior="emit_null")
-        months = months.filter(valid_or_null, null_selection_behavior="emit_null")
-        days = days.filter(valid_or_null, null_selection_behavior="emit_null")
-        date32s = date32s.filter(valid_or_null, null_selection_behavior="emit_null")
-    return years, months, days, date32s
+        # One validity bitmap, shared (zero-copy) by all three outputs
+        validity = pa.compute.and_kleene(valid.is_valid(), valid).buffers()[1]
+        years = _with_validity(years, validity)
+        months = _with_validity(months, validity)
+        days = _with_validity(days, validity)
+    return years, months, days
+
+
+def _convert_string_array(
+    *,
+    name: str,
+    array: pa.StringArray,
+    unit: Unit,
+    pattern: str,
+    format: str,
+    error_means_null: bool
+) -> pa.Date32Array:
+    if format == "YYYYMMDD":
+        parsed = _parse_unvalidated_yyyymmdd_swar(array)
+        if parsed is None:
+            parsed = _parse_unvalidated_yyyymmdd(
+                name, array, error_means_null=error_means_null
+            )
+        years, months, days = parsed
+    else:
+        parsed = None
+        if format in FIXED_WIDTH_LAYOUTS:
+            parsed = _parse_unvalidated_fixed_width(array, FIXED_WIDTH_LAYOUTS[format])
+        if parsed is None:
+            parsed = _parse_unvalidated_years_months_days(
+                name,
+                array,
+                pattern=pattern,
+                format=format,
+                error_means_null=error_means_null,
+            )
+        years, months, days = parsed
+    years, months, days = _validate_years_months_days(
+        name, array, years, months, days, error_means_null=error_means_null
+    )
+    if unit == "quarter":
+        # (before we drop nulls: null rows' months may be out of range)
+        months = _QUARTER_START_MONTH.take(months)
+
+    validity = None
+    if years.null_count:
+        # years, months and days are null in the same rows. Compute on
+        # null-free views of them, so kernels skip validity bitmaps; then
+        # restore nulls at the end. (Null rows' values are garbage, but our
+        # kernels never fail on garbage: they wrap and never divide by it.)
+        assert years.offset == 0
+        validity = years.buffers()[0]
+        years = _without_validity(years)
+        months = _without_validity(months)
+        days = _without_validity(days)
+
+    if unit == "year":
+        epoch_days = _year_start_epoch_days(years)
+    elif unit in ("quarter", "month"):
+        # (for "quarter", months already hold each quarter's first month)
+        epoch_days = _years_months_days_to_epoch_days(years, months, _I32[1])
+    else:
+        epoch_days = _years_months_days_to_epoch_days(years, months, days)
+        if unit == "week":
+            # epoch day 0 is Thursday (1970-01-01). Offset dates so Monday is
+            # 0; round down; and then un-offset dates. Shift by _WEEK_SHIFT,
+            # too: Arrow's divide truncates negative numbers towards zero.
+            epoch_days = pa.compute.subtract(
+                pa.compute.multiply(
+                    pa.compute.divide(
+                        pa.compute.add(epoch_days, _I32[3 + _WEEK_SHIFT]), _I32[7]
+                    ),
+                    _I32[7],
+                ),
+                _I32[3 + _WEEK_SHIFT],
+            )
+
+    if validity is not None:
+        epoch_days = _with_validity(epoch_days, validity)
+    # Zero-copy: date32 is int32 days since the epoch
+    return epoch_days.cast(pa.date32())
 
 
 def convert_array(
@@ -273,9 +586,16 @@ def convert_array(
     format: str,
     error_means_null: bool
 ) -> pa.Date32Array:
+    if (
+        not pa.types.is_dictionary(array.type)
+        and len(array) > _DICTIONARY_ENCODE_MIN_LENGTH
+    ):
+        # Text columns tend to repeat values. Parse each distinct value once.
+        array = pa.compute.dictionary_encode(array)
+
     if pa.types.is_dictionary(array.type):
         # raises RenderErrorException
-        converted_dictionary = convert_array(
+        converted_dictionary = _convert_string_array(
             name=name,
             array=array.dictionary,
             unit=unit,
@@ -285,64 +605,50 @@ def convert_array(
         )
         return converted_dictionary.take(array.indices)
 
-    years, months, days = _parse_unvalidated_years_months_days(
-        name, array, pattern=pattern, format=format, error_means_null=error_means_null
+    return _convert_string_array(
+        name=name,
+        array=array,
+        unit=unit,
+        pattern=pattern,
+        format=format,
+        error_means_null=error_means_null,
     )
-    date32s = _years_months_days_to_date32s(years, months, days)
 
-    years, months, days, date32s = _validate_date32s(
-        name, array, years, months, days, date32s, error_means_null=error_means_null
+
+def _dictionary_key(dictionary: pa.StringArray) -> Tuple:
+    """Identify `dictionary` by the memory it views, in O(1)."""
+    return (
+        dictionary.offset,
+        len(dictionary),
+        *(None if buf is None else buf.address for buf in dictionary.buffers()),
     )
 
-    if unit == "year":
-        return _years_months_days_to_date32s(
-            years,
-            # Hack to build array of 1 or null
-            pa.compute.not_equal(years, pa.scalar(0, pa.int8())).cast(pa.int8()),
-            pa.compute.not_equal(years, pa.scalar(0, pa.int8())).cast(pa.int8()),
-        )
-    elif unit == "quarter":
-        return _years_months_days_to_date32s(
-            years,
-            # 1, 2, 3 => 1; 4, 5, 6 => 4; 7, 8, 9 => 7; 10, 11, 12 => 10
-            pa.array([1, 1, 1, 1, 4, 4, 4, 7, 7, 7, 10, 10, 10], pa.int8()).take(
-                months
-            ),
-            # Hack to build array of 1 or null
-            pa.compute.not_equal(years, pa.scalar(0, pa.int8())).cast(pa.int8()),
-        )
-    elif unit == "month":
-        return _years_months_days_to_date32s(
-            years,
-            months,
-            # Hack to build array of 1 or null
-            pa.compute.not_equal(years, pa.scalar(0, pa.int8())).cast(pa.int8()),
-        )
-    elif unit == "week":
-        # date32==0 is Thursday (1970-01-01). Offset dates so Monday is 0;
-        # round; and then un-offset dates
-        #
-        # Negative dates (1969 and under) would round towards 0. Subtract 6
-        # so they round down.
-        negative_offset = pa.compute.multiply(
-            pa.compute.less(date32s, pa.scalar(0, pa.date32())).cast(pa.int32()),
-            i32(-6),
-        )
-        return pa.compute.subtract(
-            pa.compute.multiply(
-                pa.compute.divide(
-                    pa.compute.add(
-                        pa.compute.add(date32s.cast(pa.int32()), i32(3)),
-                        negative_offset,
-                    ),
-                    i32(7),
-                ),
-                i32(7),
-            ),
-            i32(3),
-        ).cast(pa.date32())
-    else:
-        return date32s
+
+def _group_small_chunks(chunks: List[pa.Array]) -> List[List[pa.Array]]:
+    """Group runs of small chunks, so each group has >= _MIN_BATCH_LENGTH rows.
+
+    Long chunks are never grouped: concatenating them would only copy data.
+    """
+    groups = []
+    group = []
+    group_length = 0
+    for chunk in chunks:
+        if len(chunk) >= _MIN_BATCH_LENGTH:
+            if group:
+                groups.append(group)
+                group = []
+                group_length = 0
+            groups.append([chunk])
+        else:
+            group.append(chunk)
+            group_length += len(chunk)
+            if group_length >= _MIN_BATCH_LENGTH:
+                groups.append(group)
+                group = []
+                group_length = 0
+    if group:
+        groups.append(group)
+    return groups
 
 
 def convert_chunked_array(
@@ -354,48 +660,138 @@ def convert_chunked_array(
     format: str,
     error_means_null: bool
 ) -> pa.ChunkedArray:
-    chunks = [
-        convert_array(
+    if chunked_array.num_chunks == 1:
+        # Common case: skip building (and iterating) a list of chunks
+        chunk = convert_array(
             name=name,
-            array=chunk,
+            array=chunked_array.chunk(0),
             unit=unit,
             pattern=pattern,
             format=format,
             error_means_null=error_means_null,
         )
-        for chunk in chunked_array.chunks
-    ]
+        return pa.chunked_array([chunk], pa.date32())
+
+    # Chunks often share a dictionary (e.g., after unify_dictionaries() or
+    # when read from a single Parquet column). Parse each dictionary once.
+    converted_dictionaries = {}
+
+    def convert(chunk: pa.Array) -> pa.Date32Array:
+        if not pa.types.is_dictionary(chunk.type):
+            return convert_array(
+                name=name,
+                array=chunk,
+                unit=unit,
+                pattern=pattern,
+                format=format,
+                error_means_null=error_means_null,
+            )
+
+        key = _dictionary_key(chunk.dictionary)
+        converted_dictionary = converted_dictionaries.get(key)
+        if converted_dictionary is None:
+            # raises RenderErrorException. (Worker threads may race to convert
+            # the same dictionary; that's wasteful but harmless.)
+            converted_dictionary = _convert_string_array(
+                name=name,
+                array=chunk.dictionary,
+                unit=unit,
+                pattern=pattern,
+                format=format,
+                error_means_null=error_means_null,
+            )
+            converted_dictionaries[key] = converted_dictionary
+        return converted_dictionary.take(chunk.indices)
+
+    def convert_group(group: List[pa.Array]) -> List[pa.Date32Array]:
+        if len(group) == 1:
+            return [convert(group[0])]
+
+        # Convert once, then slice the result back into the input's chunks
+        try:
+            converted = convert(pa.concat_arrays(group))
+        except RenderErrorException:
+            # Report the error we'd report chunk by chunk: the first chunk's.
+            # (Within an array, format mismatches are reported before invalid
+            # dates, so the group's error may come from a later chunk.)
+            for chunk in group:
+                convert(chunk)  # raises RenderErrorException
+            raise
+        chunks = []
+        offset = 0
+        for chunk in group:
+            chunks.append(converted.slice(offset, len(chunk)))
+            offset += len(chunk)
+        return chunks
+
+    if pa.types.is_dictionary(chunked_array.type):
+        # Dictionary chunks are cheap to convert: see convert()
+        groups = [[chunk] for chunk in chunked_array.iterchunks()]
+    else:
+        groups = _group_small_chunks(chunked_array.chunks)
+
+    n_workers = min(os.cpu_count() or 1, len(groups))
+    chunks = []
+    if n_workers <= 1 or len(chunked_array) < _PARALLEL_MIN_LENGTH:
+        for group in groups:
+            chunks.extend(convert_group(group))
+    else:
+        # pyarrow.compute kernels release the GIL, so groups convert in
+        # parallel. Keep at most n_workers groups in flight: on error, we
+        # only wait for those before raising. Results come in chunk order, so
+        # we raise the first chunk's RenderErrorException.
+        pending = deque()
+        with ThreadPoolExecutor(max_workers=n_workers) as executor:
+            for group in groups:
+                if len(pending) == n_workers:
+                    chunks.extend(pending.popleft().result())
+                pending.append(executor.submit(convert_group, group))
+            while pending:
+                chunks.extend(pending.popleft().result())
     return pa.chunked_array(chunks, pa.date32())
 
 
 def render_arrow_v1(table: pa.Table, params, **kwargs):
     error_means_null = params["error_means_null"]
     unit = params["unit"]
-    pattern = r"\A" + REGEXES[params["format"]] + r"\z"
-
-    for colname in params["colnames"]:
-        i = table.schema.get_field_index(colname)
-
-        if pa.types.is_date32(table.columns[i].type):
-            continue  # it's already date
-
+    pattern = ANCHORED_REGEXES[params["format"]]
+
+    fields = list(table.schema)
+    # schema.get_field_index() is a linear scan; look up each name in O(1)
+    name_to_index = {field.name: i for i, field in enumerate(fields)}
+    # dict.fromkeys(): convert each column once, even if colnames repeats it
+    indices = [
+        name_to_index[colname]
+        for colname in dict.fromkeys(params["colnames"])
+        # skip columns that are already date
+        if not pa.types.is_date32(fields[name_to_index[colname]].type)
+    ]
+    if not indices:
+        return ArrowRenderResult(table)  # no-op
+
+    # Build the output table once, at the end: set_column() would rebuild the
+    # schema for every column we convert
+    columns = table.columns
+    for i in indices:
+        colname = fields[i].name
         try:
-            table = table.set_column(
-                i,
-                pa.field(colname, pa.date32(), metadata={"unit": unit}),
-                convert_chunked_array(
-                    name=colname,
-                    chunked_array=table.columns[i],
-                    unit=unit,
-                    pattern=pattern,
-                    format=params["format"],
-                    error_means_null=error_means_null,
-                ),
+            columns[i] = convert_chunked_array(
+                name=colname,
+                chunked_array=columns[i],
+                unit=unit,
+                pattern=pattern,
+                format=params["format"],
+                error_means_null=error_means_null,
             )
         except RenderErrorException as err:
             return ArrowRenderResult(pa.table({}), [err.render_error])
+        fields[i] = pa.field(colname, pa.date32(), metadata={"unit": unit})
 
-    return ArrowRenderResult(table)
+    return ArrowRenderResult(
+        pa.Table.from_arrays(
+            columns, schema=pa.schema(fields, metadata=table.schema.metadata)
+        )
+    )
 
 
 def migrate_params(params):
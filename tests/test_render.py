@@ -23,6 +23,165 @@ def test_convert_date_to_date():
     assert_result_equals(render(table, P(colnames=["A"])), ArrowRenderResult(table))
 
 
+def test_convert_multiple_columns():
+    assert_result_equals(
+        render(
+            make_table(
+                make_column("A", ["2021-04-28"]),
+                make_column("B", ["x"]),
+                make_column("C", ["2021-05-11"]),
+            ),
+            P(colnames=["C", "A"], unit="month"),
+        ),
+        ArrowRenderResult(
+            make_table(
+                make_column("A", [date(2021, 4, 1)], unit="month"),
+                make_column("B", ["x"]),
+                make_column("C", [date(2021, 5, 1)], unit="month"),
+            )
+        ),
+    )
+
+
+def test_convert_repeated_colname():
+    assert_result_equals(
+        render(make_table(make_column("A", ["2021-04-28"])), P(colnames=["A", "A"])),
+        ArrowRenderResult(
+            make_table(make_column("A", [date(2021, 4, 28)], unit="day"))
+        ),
+    )
+
+
+def test_convert_multiple_row_groups():
+    table1 = make_table(make_column("A", ["2021-04-28"]))
+    table2 = make_table(make_column("A", ["2021-05-11", None]))
+    expected1 = make_table(make_column("A", [date(2021, 4, 28)], unit="day"))
+    expected2 = make_table(make_column("A", [date(2021, 5, 11), None], unit="day"))
+    assert_result_equals(
+        render(
+            pa.Table.from_batches(table1.to_batches() + table2.to_batches()),
+            P(colnames=["A"]),
+        ),
+        ArrowRenderResult(
+            pa.Table.from_batches(expected1.to_batches() + expected2.to_batches())
+        ),
+    )
+
+
+def test_convert_many_small_row_groups():
+    values = [["2021-04-28"], [], ["2021-05-11", None], ["2021-05-12"]]
+    dates = [[date(2021, 4, 28)], [], [date(2021, 5, 11), None], [date(2021, 5, 12)]]
+    assert_result_equals(
+        render(
+            pa.table({"A": pa.chunked_array(values, pa.utf8())}),
+            P(colnames=["A"]),
+        ),
+        ArrowRenderResult(
+            pa.Table.from_arrays(
+                [pa.chunked_array(dates, pa.date32())],
+                schema=make_table(make_column("A", [], pa.date32(), unit="day")).schema,
+            )
+        ),
+    )
+
+
+def test_convert_many_small_row_groups_error_in_chunk_order():
+    # Each chunk reports its own error; the first chunk's error wins
+    assert_result_equals(
+        render(
+            pa.table({"A": pa.chunked_array([["2021-02-30"], ["x"]], pa.utf8())}),
+            P(colnames=["A"]),
+        ),
+        ArrowRenderResult(
+            make_table(),
+            [
+                RenderError(
+                    i18n_message(
+                        "error.invalidDate",
+                        dict(column="A", value="2021-02-30"),
+                    )
+                )
+            ],
+        ),
+    )
+
+
+def test_convert_row_groups_sharing_dictionary():
+    array = pa.array(["2021-04-28", None, "2021-05-11"]).dictionary_encode()
+    assert_result_equals(
+        render(
+            pa.table({"A": pa.chunked_array([array[:2], array[1:]])}),
+            P(colnames=["A"]),
+        ),
+        ArrowRenderResult(
+            pa.Table.from_batches(
+                make_table(
+                    make_column("A", [date(2021, 4, 28), None], unit="day")
+                ).to_batches()
+                + make_table(
+                    make_column("A", [None, date(2021, 5, 11)], unit="day")
+                ).to_batches()
+            )
+        ),
+    )
+
+
+def test_convert_many_row_groups_in_parallel():
+    tables = [
+        make_table(make_column("A", ["2021-04-28", "2021-05-%02d" % (i + 1)] * 20000))
+        for i in range(4)
+    ]
+    expected = [
+        make_table(
+            make_column(
+                "A", [date(2021, 4, 28), date(2021, 5, i + 1)] * 20000, unit="day"
+            )
+        )
+        for i in range(4)
+    ]
+    assert_result_equals(
+        render(
+            pa.Table.from_batches([t.to_batches()[0] for t in tables]),
+            P(colnames=["A"]),
+        ),
+        ArrowRenderResult(pa.Table.from_batches([t.to_batches()[0] for t in expected])),
+    )
+
+
+def test_convert_many_row_groups_in_parallel_error():
+    tables = [
+        make_table(make_column("A", ["2021-04-28"] * 40000)),
+        make_table(make_column("A", ["2021-04-28"] * 39999 + ["2021-02-29"])),
+        make_table(make_column("A", ["2021-04-28"] * 39999 + ["2021-02-30"])),
+    ]
+    assert_result_equals(
+        render(
+            pa.Table.from_batches([t.to_batches()[0] for t in tables]),
+            P(colnames=["A"]),
+        ),
+        ArrowRenderResult(
+            make_table(),
+            [
+                RenderError(
+                    i18n_message(
+                        "error.invalidDate",
+                        dict(column="A", value="2021-02-29"),
+                    )
+                )
+            ],
+        ),
+    )
+
+
+def test_convert_zero_row_groups():
+    table = make_table(make_column("A", ["2021-04-28"]))
+    expected = make_table(make_column("A", [date(2021, 4, 28)], unit="day"))
+    assert_result_equals(
+        render(pa.Table.from_batches([], table.schema), P(colnames=["A"])),
+        ArrowRenderResult(pa.Table.from_batches([], expected.schema)),
+    )
+
+
 def test_convert_yyyy_mm_dd():
     assert_result_equals(
         render(make_table(make_column("A", ["2021-04-28"])), P(colnames=["A"])),
@@ -32,6 +191,24 @@ def test_convert_yyyy_mm_dd():
     )
 
 
+def test_convert_yyyy_mm_dd_not_zero_padded():
+    assert_result_equals(
+        render(
+            make_table(make_column("A", ["2021-04-28", "2021-4-5", ""])),
+            P(colnames=["A"]),
+        ),
+        ArrowRenderResult(
+            make_table(
+                make_column(
+                    "A",
+                    [date(2021, 4, 28), date(2021, 4, 5), None],
+                    unit="day",
+                )
+            )
+        ),
+    )
+
+
 def test_convert_yyyymmdd():
     assert_result_equals(
         render(
@@ -44,6 +221,68 @@ def test_convert_yyyymmdd():
     )
 
 
+def test_convert_yyyymmdd_mismatch():
+    assert_result_equals(
+        render(
+            make_table(make_column("A", ["20210428", "2021042x"])),
+            P(colnames=["A"], format="YYYYMMDD"),
+        ),
+        ArrowRenderResult(
+            make_table(),
+            [
+                RenderError(
+                    i18n_message(
+                        "error.formatMismatch",
+                        dict(column="A", value="2021042x", format="YYYYMMDD"),
+                    )
+                )
+            ],
+        ),
+    )
+
+
+def test_convert_yyyymmdd_mismatch_and_invalid_to_null():
+    assert_result_equals(
+        render(
+            make_table(
+                make_column(
+                    "A", ["20210428", "2021042", "", None, "20210230", "+2021042"]
+                )
+            ),
+            P(colnames=["A"], format="YYYYMMDD", error_means_null=True),
+        ),
+        ArrowRenderResult(
+            make_table(
+                make_column(
+                    "A",
+                    [date(2021, 4, 28), None, None, None, None, None],
+                    unit="day",
+                )
+            )
+        ),
+    )
+
+
+def test_convert_yyyymmdd_mismatch_to_null_in_sliced_table():
+    table = make_table(
+        make_column("A", ["x", "x", "x", "20210428", "2021042", "", None, "20210301"])
+    )
+    assert_result_equals(
+        render(
+            table.slice(3), P(colnames=["A"], format="YYYYMMDD", error_means_null=True)
+        ),
+        ArrowRenderResult(
+            make_table(
+                make_column(
+                    "A",
+                    [date(2021, 4, 28), None, None, None, date(2021, 3, 1)],
+                    unit="day",
+                )
+            )
+        ),
+    )
+
+
 def test_convert_m_d_yyyy():
     assert_result_equals(
         render(
@@ -56,6 +295,22 @@ def test_convert_m_d_yyyy():
     )
 
 
+def test_convert_m_d_yyyy_zero_padded():
+    assert_result_equals(
+        render(
+            make_table(make_column("A", ["04/28/2021", "12/01/1999", ""])),
+            P(colnames=["A"], format="M/D/YYYY"),
+        ),
+        ArrowRenderResult(
+            make_table(
+                make_column(
+                    "A", [date(2021, 4, 28), date(1999, 12, 1), None], unit="day"
+                )
+            )
+        ),
+    )
+
+
 def test_convert_d_m_yyyy():
     assert_result_equals(
         render(
@@ -96,6 +351,24 @@ def test_convert_d_m_yy():
     )
 
 
+def test_convert_d_m_yy_zero_padded():
+    assert_result_equals(
+        render(
+            make_table(make_column("A", ["28/04/21", "01/12/69", "01/12/70"])),
+            P(colnames=["A"], format="D/M/YY"),
+        ),
+        ArrowRenderResult(
+            make_table(
+                make_column(
+                    "A",
+                    [date(2021, 4, 28), date(2069, 12, 1), date(1970, 12, 1)],
+                    unit="day",
+                )
+            )
+        ),
+    )
+
+
 def test_convert_regex_mismatch():
     assert_result_equals(
         render(make_table(make_column("A", ["2021-04-28 "])), P(colnames=["A"])),
@@ -159,6 +432,39 @@ def test_convert_invalid_day():
     )
 
 
+def test_convert_leap_years_and_month_lengths():
+    assert_result_equals(
+        render(
+            make_table(
+                make_column(
+                    "A",
+                    [
+                        "1900-02-28",
+                        "2000-02-29",
+                        "2100-02-28",
+                        "1900-02-29",
+                        "2021-00-01",
+                        "2021-04-00",
+                        "2021-04-31",
+                        "2021-13-01",
+                    ],
+                )
+            ),
+            P(colnames=["A"], error_means_null=True),
+        ),
+        ArrowRenderResult(
+            make_table(
+                make_column(
+                    "A",
+                    [date(1900, 2, 28), date(2000, 2, 29), date(2100, 2, 28)]
+                    + [None] * 5,
+                    unit="day",
+                )
+            )
+        ),
+    )
+
+
 def test_convert_empty_string_is_null_not_error():
     assert_result_equals(
         render(
@@ -281,3 +587,39 @@ def test_convert_to_year():
             make_table(make_column("A", [date(2021, 1, 1)], unit="year"))
         ),
     )
+
+
+def test_convert_many_repeated_values():
+    assert_result_equals(
+        render(
+            make_table(make_column("A", ["2021-04-28", None, "2021-02-29"] * 2000)),
+            P(colnames=["A"], error_means_null=True),
+        ),
+        ArrowRenderResult(
+            make_table(
+                make_column(
+                    "A", [date(2021, 4, 28), None, None] * 2000, pa.date32(), unit="day"
+                )
+            )
+        ),
+    )
+
+
+def test_convert_many_repeated_values_error():
+    assert_result_equals(
+        render(
+            make_table(make_column("A", ["2021-04-28"] * 5000 + ["2021-02-29"])),
+            P(colnames=["A"]),
+        ),
+        ArrowRenderResult(
+            make_table(),
+            [
+                RenderError(
+                    i18n_message(
+                        "error.invalidDate",
+                        dict(column="A", value="2021-02-29"),
+                    )
+                )
+            ],
+        ),
+    )